@@ -1,61 +1,184 @@
 #!/usr/bin/env python
 # /// script
+# requires-python = ">=3.10"
 # dependencies = ["textual>=0.47.0"]
 # ///
 
+import asyncio
+import hashlib
+import math
+import os
+import re
+import shutil
 import subprocess
+import sys
 import json
+import time
 import webbrowser
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from operator import attrgetter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 from textual.app import App, ComposeResult
 from textual.widgets import DataTable, Footer, Header
+from textual.widgets.data_table import ColumnKey
 from textual.binding import Binding
 from textual import events, work
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Issue:
     number: int
     title: str
     created_at: str
-    labels: List[str]
+    labels: Tuple[str, ...]
     url: str
 
 
-def fetch_issues() -> List[Issue]:
-    """Fetch the 10 most recent issues from the current git repository using gh CLI."""
+ISSUE_LIMIT = 10
+
+# Resolve executables once rather than searching PATH on every spawn
+_GH = shutil.which("gh")
+_GIT = shutil.which("git") or "git"
+
+# Titles longer than this are cut so the whole title, ellipsis included, fits in the column
+_MAX_TITLE = 80
+_ELLIPSIS = "…"
+_TITLE_CUT = _MAX_TITLE - len(_ELLIPSIS)
+
+# owner/repo at the end of an HTTPS (https://host/owner/repo.git) or SSH (git@host:owner/repo) remote
+_REMOTE_RE = re.compile(r"[:/]([^/:]+)/([^/]+?)(?:\.git)?/?$")
+
+# Pulls every field a table row needs out of an Issue in one call
+_ROW_FIELDS = attrgetter("number", "title", "created_at", "labels")
+
+# One round-trip for both the window title and the table; gh fills in {owner} and {repo}
+# from the repository of the current directory
+BOOTSTRAP_QUERY = """
+query($owner: String!, $repo: String!, $limit: Int!) {
+  repository(owner: $owner, name: $repo) {
+    nameWithOwner
+    issues(first: $limit, states: OPEN, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes { number title createdAt url labels(first: 10) { nodes { name } } }
+    }
+  }
+}
+"""
+
+# GitHub timestamps are always YYYY-MM-DDTHH:MM:SSZ, so the date is the first 10 characters
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}T")
+
+# Seconds a cached GraphQL response is reused before hitting GitHub again
+CACHE_TTL = float(os.environ.get("GH_ISSUES_CACHE_TTL", "60"))
+
+# Per-user so other accounts on the host can neither read nor plant cached issue URLs
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "gh-issues"
+
+
+def _cache_path(repo_dir: str) -> Path:
+    """Return the on-disk cache file for the issue list of the repository at repo_dir."""
+    key = f"{repo_dir}:bootstrap:{ISSUE_LIMIT}".encode()
+    return CACHE_DIR / f"{hashlib.sha1(key).hexdigest()[:16]}.json"
+
+
+def _read_cache(path: Path, max_age: Optional[float] = None) -> Optional[bytes]:
+    """Return the cached response if it is younger than max_age (CACHE_TTL by default)."""
+    if max_age is None:
+        max_age = CACHE_TTL
+    try:
+        # A modification time in the future counts as stale rather than fresh forever
+        if 0 <= time.time() - path.stat().st_mtime < max_age:
+            return path.read_bytes()
+    except OSError:
+        pass
+    return None
+
+
+def _write_cache(path: Path, data: bytes) -> None:
+    """Atomically replace the cache file so readers never see a partial write."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
     try:
-        result = subprocess.run(
-            ["gh", "issue", "list", "--limit", "10", "--json", "number,title,createdAt,labels,url"],
-            capture_output=True,
-            text=True,
-            check=True
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def _parse_bootstrap(data: bytes) -> Tuple[str, List[Issue]]:
+    """Turn a bootstrap GraphQL response into the repository name and its issues."""
+    repository = json_loads(data)["data"]["repository"]
+    # Label names repeat across issues, so intern them to share one string per name
+    issues = [
+        Issue(
+            number=item["number"],
+            title=item["title"],
+            created_at=item["createdAt"],
+            labels=tuple([sys.intern(label["name"]) for label in item["labels"]["nodes"]]),
+            url=item["url"]
         )
-        
-        issues_data = json.loads(result.stdout)
-        issues = []
-        
-        for item in issues_data:
-            labels = [label["name"] for label in item.get("labels", [])]
-            issue = Issue(
-                number=item["number"],
-                title=item["title"],
-                created_at=item["createdAt"],
-                labels=labels,
-                url=item["url"]
+        for item in repository["issues"]["nodes"]
+    ]
+    return repository["nameWithOwner"], issues
+
+
+def cached_bootstrap() -> Optional[Tuple[str, List[Issue]]]:
+    """Return the last cached bootstrap response regardless of its age, if there is one."""
+    data = _read_cache(_cache_path(os.getcwd()), max_age=math.inf)
+    if data is None:
+        return None
+    try:
+        return _parse_bootstrap(data)
+    except Exception:
+        return None
+
+
+async def fetch_bootstrap(force: bool = False) -> Tuple[str, List[Issue]]:
+    """Fetch the repository name and its most recent issues with a single gh GraphQL call.
+    
+    Responses are cached on disk for CACHE_TTL seconds; pass force=True to bypass the cache.
+    """
+    if _GH is None:
+        raise RuntimeError("gh CLI not found. Please install GitHub CLI: https://cli.github.com")
+    
+    # gh resolves the repository from the working directory, so key the cache on it
+    cache = _cache_path(os.getcwd())
+    cached = None if force else _read_cache(cache)
+    if cached is not None:
+        try:
+            return _parse_bootstrap(cached)
+        except Exception:
+            # A corrupt or foreign-format cache file is a miss, not an error
+            pass
+    
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            _GH, "api", "graphql",
+            "-F", "owner={owner}", "-F", "repo={repo}", "-F", f"limit={ISSUE_LIMIT}",
+            "-f", f"query={BOOTSTRAP_QUERY}",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(
+                proc.returncode, "gh", stdout, stderr.decode("utf-8", "replace")
             )
-            issues.append(issue)
         
-        return issues
+        repo_name, issues = _parse_bootstrap(stdout)
+        _write_cache(cache, stdout)
+        return repo_name, issues
     
     except subprocess.CalledProcessError as e:
         if "not a git repository" in e.stderr:
             raise RuntimeError("Not in a git repository")
-        elif "gh: command not found" in str(e):
-            raise RuntimeError("gh CLI not found. Please install GitHub CLI: https://cli.github.com")
         else:
             raise RuntimeError(f"Failed to fetch issues: {e.stderr}")
     except json.JSONDecodeError:
@@ -64,25 +187,41 @@ def fetch_issues() -> List[Issue]:
         raise RuntimeError(f"Unexpected error: {str(e)}")
 
 
-def get_repo_name() -> str:
-    """Get the repository name from git remote."""
+# Repository names already resolved by get_repo_name, by working directory
+_repo_names: Dict[str, str] = {}
+
+
+async def get_repo_name() -> str:
+    """Get the repository name from git remote, for when gh itself cannot be queried.
+    
+    Resolved names are memoized per working directory; failures are retried on the next call.
+    """
+    cwd = os.getcwd()
+    if cwd not in _repo_names:
+        repo_name = await _read_repo_name()
+        if repo_name is None:
+            return "Unknown Repository"
+        _repo_names[cwd] = repo_name
+    return _repo_names[cwd]
+
+
+async def _read_repo_name() -> Optional[str]:
+    """Read the repository name from the origin remote URL, or None if it cannot be read."""
     try:
-        result = subprocess.run(
-            ["git", "remote", "get-url", "origin"],
-            capture_output=True,
-            text=True,
-            check=True
+        proc = await asyncio.create_subprocess_exec(
+            _GIT, "remote", "get-url", "origin",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
         )
-        url = result.stdout.strip()
-        # Extract repo name from URL (works for both HTTPS and SSH)
-        if url.endswith('.git'):
-            url = url[:-4]
-        parts = url.split('/')
-        if len(parts) >= 2:
-            return f"{parts[-2]}/{parts[-1]}"
-        return "Unknown Repository"
-    except:
-        return "Unknown Repository"
+        stdout, _ = await proc.communicate()
+        if proc.returncode != 0:
+            return None
+        match = _REMOTE_RE.search(stdout.decode("utf-8", "replace").strip())
+        if match:
+            return f"{match.group(1)}/{match.group(2)}"
+        return None
+    except Exception:
+        return None
 
 
 class IssuesApp(App):
@@ -112,65 +251,103 @@ class IssuesApp(App):
     def __init__(self):
         super().__init__()
         self.issues: List[Issue] = []
-        repo_name = get_repo_name()
-        self.title = f"GitHub Issues - {repo_name}"
+        self._issues_by_key: Dict[str, Issue] = {}
+        # Cell values currently shown in the table, by row key, so refreshes can be diffed
+        self._rows: Dict[str, Tuple[str, ...]] = {}
+        self._columns: List[ColumnKey] = []
+        self._table: Optional[DataTable] = None
+        self.title = "GitHub Issues"
     
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
         yield Header()
-        yield DataTable(cursor_type="row")
+        self._table = DataTable(cursor_type="row")
+        yield self._table
         yield Footer()
     
     async def on_mount(self) -> None:
         """Called when app starts."""
-        table = self.query_one(DataTable)
-        table.add_columns("Issue #", "Title", "Date", "Labels")
-        table.cursor_type = "row"
+        table = self._table
+        self._columns = table.add_columns("Issue #", "Title", "Date", "Labels")
         table.zebra_stripes = True
         
         self.load_issues()
     
-    @work(thread=True)
-    def load_issues(self) -> None:
-        """Load issues and populate the table."""
-        table = self.query_one(DataTable)
-        table.clear()
+    @work(exclusive=True)
+    async def load_issues(self, force: bool = False) -> None:
+        """Load the repository name and issues and populate the table."""
+        if not force and not self.issues:
+            # Show whatever the last run cached, however old, while gh fetches fresh data
+            cached = cached_bootstrap()
+            if cached is not None:
+                self._show_issues(*cached)
+                # Flag the rows as possibly stale until the live fetch below replaces the title
+                self.title = f"{self.title} (cached)"
         
         try:
-            self.issues = fetch_issues()
+            repo_name, issues = await fetch_bootstrap(force)
+        except RuntimeError as e:
+            self.title = f"GitHub Issues - {await get_repo_name()}"
+            self.issues = []
+            self._issues_by_key = {}
+            self._show_message(str(e))
+            return
+        
+        self._show_issues(repo_name, issues)
+    
+    def _show_issues(self, repo_name: str, issues: List[Issue]) -> None:
+        """Populate the table, updating only changed cells when the rows are unchanged."""
+        self.title = f"GitHub Issues - {repo_name}"
+        self.issues = issues
+        self._issues_by_key = {str(issue.number): issue for issue in issues}
+        
+        if not self.issues:
+            self._show_message("No issues found")
+            return
+        
+        rows: Dict[str, Tuple[str, ...]] = {}
+        for number, title, created_at, labels in map(_ROW_FIELDS, self.issues):
+            # Format date, only falling back to the full parser for unexpected formats
+            if _ISO_DATE_RE.match(created_at):
+                date_str = created_at[:10]
+            else:
+                date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+                date_str = date.strftime("%Y-%m-%d")
             
-            if not self.issues:
-                table.add_row("", "No issues found", "", "")
-                return
+            # Format labels
+            labels_str = ", ".join(labels)
             
-            for issue in self.issues:
-                # Format date
-                date = datetime.fromisoformat(issue.created_at.replace('Z', '+00:00'))
-                date_str = date.strftime("%Y-%m-%d")
-                
-                # Format labels
-                labels_str = ", ".join(issue.labels) if issue.labels else ""
-                
-                # Truncate title if too long
-                title = issue.title
-                if len(title) > 80:
-                    title = title[:77] + "..."
-                
-                table.add_row(
-                    str(issue.number),
-                    title,
-                    date_str,
-                    labels_str,
-                    key=str(issue.number)
-                )
+            # Truncate title if too long
+            if len(title) > _MAX_TITLE:
+                title = title[:_TITLE_CUT] + _ELLIPSIS
+            
+            key = str(number)
+            rows[key] = (key, title, date_str, labels_str)
         
-        except RuntimeError as e:
-            table.add_row("", str(e), "", "")
-            self.issues = []
+        table = self._table
+        if list(rows) == list(self._rows):
+            # Same issues in the same order: only touch the cells that changed
+            for key, row in rows.items():
+                for column, value, shown in zip(self._columns, row, self._rows[key]):
+                    if value != shown:
+                        table.update_cell(key, column, value, update_width=True)
+        else:
+            # add_rows is only a loop over add_row and cannot set row keys, so call add_row directly
+            table.clear()
+            add_row = table.add_row
+            for key, row in rows.items():
+                add_row(*row, key=key)
+        self._rows = rows
+    
+    def _show_message(self, message: str) -> None:
+        """Replace the table contents with a single message row."""
+        self._table.clear()
+        self._table.add_row("", message, "", "")
+        self._rows = {}
     
     async def action_open_issue(self) -> None:
         """Open the selected issue in the browser."""
-        table = self.query_one(DataTable)
+        table = self._table
         
         if not self.issues:
             self.notify("No issues loaded", severity="warning")
@@ -180,26 +357,21 @@ class IssuesApp(App):
             self.notify("No row selected", severity="warning")
             return
         
-        try:
-            # Use coordinate_to_cell_key to get the row key from cursor position
-            row_key, _ = table.coordinate_to_cell_key(table.cursor_coordinate)
-            self.notify(f"Debug: row_key={row_key}, cursor_coordinate={table.cursor_coordinate}")
-            
-            issue = next((i for i in self.issues if str(i.number) == row_key), None)
-            
-            if issue:
-                self.notify(f"Debug: Found issue #{issue.number}, URL: {issue.url}")
-                webbrowser.open(issue.url)
-                self.notify(f"Opening issue #{issue.number}")
-            else:
-                self.notify(f"Could not find issue with key: {row_key}", severity="error")
-        except Exception as e:
-            self.notify(f"Failed to open issue: {str(e)}", severity="error")
+        # Use coordinate_to_cell_key to get the row key from cursor position
+        row_key, _ = table.coordinate_to_cell_key(table.cursor_coordinate)
+        issue = self._issues_by_key.get(row_key.value)
+        self.log(f"row_key={row_key} issue={issue}")
+        
+        if issue:
+            webbrowser.open(issue.url)
+            self.notify(f"Opening issue #{issue.number}")
+        else:
+            self.notify(f"Could not find issue with key: {row_key.value}", severity="error")
     
     def action_refresh(self) -> None:
         """Refresh the issues list."""
         self.notify("Refreshing issues...")
-        self.load_issues()
+        self.load_issues(force=True)
         self.notify("Issues refreshed")
 
 
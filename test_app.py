@@ -31,20 +31,26 @@ try:
 except:
     print("✗ Error checking remote")
 
-# Test 4: Test gh issue list command
+# Test 4: Test the gh GraphQL query used by the app
 try:
+    query = (
+        "query($owner: String!, $repo: String!) { repository(owner: $owner, name: $repo) { "
+        "nameWithOwner issues(first: 10, states: OPEN, orderBy: {field: CREATED_AT, direction: DESC}) { "
+        "nodes { number title createdAt url labels(first: 10) { nodes { name } } } } } }"
+    )
     result = subprocess.run(
-        ["gh", "issue", "list", "--limit", "10", "--json", "number,title,createdAt,labels,url"],
+        ["gh", "api", "graphql", "-F", "owner={owner}", "-F", "repo={repo}", "-f", f"query={query}"],
         capture_output=True,
         text=True
     )
     if result.returncode == 0:
-        issues = json.loads(result.stdout)
-        print(f"✓ gh issue list works, found {len(issues)} issues")
+        repository = json.loads(result.stdout)["data"]["repository"]
+        issues = repository["issues"]["nodes"]
+        print(f"✓ gh api graphql works for {repository['nameWithOwner']}, found {len(issues)} issues")
         if issues:
             print(f"  First issue: #{issues[0]['number']} - {issues[0]['title']}")
     else:
-        print(f"✗ gh issue list failed: {result.stderr}")
+        print(f"✗ gh api graphql failed: {result.stderr}")
 except Exception as e:
     print(f"✗ Error running gh: {e}")
 